@@ -31,6 +31,16 @@ const sharp = require('sharp');
 const WIDTH = 1200;
 const HEIGHT = 630;
 
+// Preview scale for iterating on card designs: OG_SCALE=0.5 rasterizes the
+// SVG at half size, then upsamples to full size before the grain goes on.
+// Previews go to images/preview/ so they never overwrite the committed cards.
+const SCALE = process.env.OG_SCALE ? Number(process.env.OG_SCALE) : 1;
+if (!(SCALE > 0 && SCALE <= 1)) {
+  console.error(`\n  OG_SCALE must be a number in (0, 1], got "${process.env.OG_SCALE}".\n`);
+  process.exit(1);
+}
+const PREVIEW_DIR = './images/preview';
+
 // Design tokens, mirrored from styles.css
 const tokens = {
   bgWarm: '#FAF9F7',
@@ -266,13 +276,30 @@ function renderCardSvg(config) {
 function createGrainOverlay() {
   resetSeed(777);
   const buffer = Buffer.alloc(WIDTH * HEIGHT * 4);
-  for (let i = 0; i < WIDTH * HEIGHT; i++) {
-    const v = seededRandom() < 0.5 ? 0 : 255;
-    buffer[i * 4] = v;
-    buffer[i * 4 + 1] = v;
-    buffer[i * 4 + 2] = v;
-    buffer[i * 4 + 3] = Math.floor(seededRandom() * 7);
+  // Write each RGBA pixel as one 32-bit word instead of four byte stores.
+  const pixels = new Uint32Array(buffer.buffer, buffer.byteOffset, WIDTH * HEIGHT);
+
+  // Only 14 distinct pixels exist (black or white, alpha 0-6): pack them once.
+  const littleEndian = os.endianness() === 'LE';
+  const words = new Uint32Array(14);
+  for (let k = 0; k < 14; k++) {
+    const v = k < 7 ? 0 : 255;
+    const a = k % 7;
+    words[k] = littleEndian
+      ? (a << 24 | v << 16 | v << 8 | v) >>> 0
+      : (v << 24 | v << 16 | v << 8 | a) >>> 0;
+  }
+
+  // Same LCG as seededRandom(), inlined and kept in integers so the hot loop
+  // makes no calls and no float divisions.
+  let s = seed;
+  for (let i = 0; i < pixels.length; i++) {
+    s = (s * 9301 + 49297) % 233280;
+    const k = s < 116640 ? 0 : 7;
+    s = (s * 9301 + 49297) % 233280;
+    pixels[i] = words[k + ((s * 7 / 233280) | 0)];
   }
+  seed = s;
   return buffer;
 }
 
@@ -463,31 +490,43 @@ const pages = [
 
 async function generateOGImage(config, grain) {
   const svg = Buffer.from(renderCardSvg(config));
+  const outputPath = SCALE === 1
+    ? config.outputPath
+    : path.join(PREVIEW_DIR, path.basename(config.outputPath));
+
+  let image = sharp(svg, { density: 72 * SCALE });
+  if (SCALE !== 1) image = image.resize(WIDTH, HEIGHT);
 
-  await sharp(svg)
+  await image
     .composite([{
       input: grain,
       raw: { width: WIDTH, height: HEIGHT, channels: 4 },
       top: 0,
       left: 0,
     }])
-    .png({ compressionLevel: 9 })
-    .toFile(config.outputPath);
+    // The card is fully opaque: drop alpha once, after the single
+    // composite, so the PNG encoder only sees RGB.
+    .removeAlpha()
+    .png({ compressionLevel: 6 })
+    .toFile(outputPath);
 
-  console.log(`  Generated: ${config.outputPath}`);
+  console.log(`  Generated: ${outputPath}`);
 }
 
 if (!fs.existsSync('./images')) {
   fs.mkdirSync('./images');
 }
+if (SCALE !== 1 && !fs.existsSync(PREVIEW_DIR)) {
+  fs.mkdirSync(PREVIEW_DIR);
+}
 
 async function main() {
   console.log('\n  Generating OG share cards...\n');
 
+  // Cards are independent. sharp runs each pipeline on libuv's thread pool,
+  // so starting them all at once spreads the work across cores.
   const grain = createGrainOverlay();
-  for (const config of pages) {
-    await generateOGImage(config, grain);
-  }
+  await Promise.all(pages.map((config) => generateOGImage(config, grain)));
 
   console.log('\n  All OG images generated.\n');
 }